@@ -16,6 +16,9 @@
 #############################################################################
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
 from owslib.wfs import WebFeatureService
 from owslib.fes import *
 from owslib.etree import etree
@@ -24,6 +27,9 @@ from osgeo import gdal
 import geopandas as gpd
 import json
 
+import requests
+from requests.adapters import HTTPAdapter
+
 from nabatpy.utils import normalize_grid_frame
 
 HASH_DICT = {'Alaska': '5b7b54efe4b0f5d578846149',
@@ -60,7 +66,81 @@ def get_layer_name(response):
     return [k for k in response.contents.keys() if k not in ['sb:boundingBox', 'sb:footprint']][0]
 
 
-def get_grts_data(grid_frame, state='', high_priority=False):
+@lru_cache(maxsize=None)
+def _get_wfs(grid_frame):
+    """
+    Return a cached WebFeatureService for a (normalized) grid frame.
+
+    Instantiating the service triggers a GetCapabilities round trip, so we
+    only want to pay for it once per frame.
+    """
+    hash = HASH_DICT[grid_frame]
+    return WebFeatureService(url=URL_TEMPLATE.format(grid_hash=hash), version='1.1.0')
+
+
+_session = None
+
+
+def _get_session(pool_size=8):
+    """
+    Return the shared requests Session used for feature retrieval.
+
+    A single session keeps connections to sciencebase.gov alive between
+    page requests instead of paying the TLS handshake for every page.
+    """
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        _session.mount('https://', adapter)
+        _session.mount('http://', adapter)
+    return _session
+
+
+def _fetch_page(wfs, layer_name, xml_filter, page_size, start_index):
+    """
+    Fetch a single page of features and return the parsed GeoJSON dict.
+    """
+    # WFS makes no ordering guarantee between independent requests, so the
+    # pages are sorted on GRTS_ID to keep startIndex windows disjoint.
+    params = {'service': 'WFS', 'version': '1.1.0', 'request': 'GetFeature',
+              'typename': layer_name, 'srsname': 'EPSG:4326',
+              'outputFormat': 'application/json', 'sortBy': 'GRTS_ID',
+              'maxFeatures': page_size, 'startIndex': start_index}
+    if xml_filter is not None:
+        params['filter'] = xml_filter
+
+    response = _get_session().get(wfs.url, params=params, timeout=120)
+    response.raise_for_status()
+    return response.json()
+
+
+def _get_features(wfs, layer_name, xml_filter=None, page_size=5000, max_workers=4):
+    """
+    Pull all the features for a layer as one GeoJSON FeatureCollection,
+    paging through the results with concurrent GetFeature requests so that
+    large frames don't hinge on a single monolithic response.
+    """
+    features = []
+    start_index = 0
+    done = False
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while not done:
+            starts = [start_index + i * page_size for i in range(max_workers)]
+            pages = executor.map(lambda s: _fetch_page(wfs, layer_name, xml_filter,
+                                                       page_size, s), starts)
+            for page in pages:
+                page_features = page.get('features', [])
+                features.extend(page_features)
+                if len(page_features) < page_size:
+                    done = True
+                    break
+            start_index += max_workers * page_size
+
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+def get_grts_data(grid_frame, state='', high_priority=False, page_size=5000, max_workers=4):
     """
     Returns a geodataframe of the selected data.
 
@@ -69,6 +149,10 @@ def get_grts_data(grid_frame, state='', high_priority=False):
     grid_frame : str
                  Grid frame of layer to return: conus, canada, mexico , alaska, hawaii, puertorico
     filters : list of owslib fes queries
+    page_size : int
+                Number of features requested per GetFeature page
+    max_workers : int
+                  Number of concurrent page requests
 
     Returns
     -------
@@ -78,9 +162,8 @@ def get_grts_data(grid_frame, state='', high_priority=False):
     """
     filter = None
     grid_frame = normalize_grid_frame(grid_frame)
-    hash = HASH_DICT[grid_frame]
 
-    wfs = WebFeatureService(url=URL_TEMPLATE.format(grid_hash=hash), version='1.1.0')
+    wfs = _get_wfs(grid_frame)
     layer_name = get_layer_name(wfs)
 
     if state:
@@ -102,15 +185,14 @@ def get_grts_data(grid_frame, state='', high_priority=False):
             filter = priority_filter
 
     if filter is not None:
-        # return filter
         xml_filter = etree.tostring(filter.toXML()).decode("utf-8")
-        wfs_json = wfs.getfeature(typename=[layer_name], filter=xml_filter,
-                                  propertyname=None, srsname='EPSG:4326', outputFormat='application/json').read()
     else:
-        wfs_json = wfs.getfeature(typename=[layer_name], propertyname=None,
-                                  srsname='EPSG:4326', outputFormat='application/json').read()
+        xml_filter = None
+
+    feature_collection = _get_features(wfs, layer_name, xml_filter=xml_filter,
+                                       page_size=page_size, max_workers=max_workers)
 
-    gdf = gpd.GeoDataFrame.from_features(eval(wfs_json))
+    gdf = gpd.GeoDataFrame.from_features(feature_collection)
     gdf.crs = {'init': 'epsg:4326'}
 
     return gdf
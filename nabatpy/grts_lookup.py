@@ -1,6 +1,8 @@
+from functools import lru_cache
+
 import numpy as np
 import pandas as pd
-from pyproj import Proj, transform
+from pyproj import Proj, Transformer
 from pathlib import Path
 
 from nabatpy.utils import normalize_grid_frame
@@ -54,16 +56,48 @@ WGS84 = Proj(init='epsg:4326')
 # Augment the specs with some derivative metrics
 for sample_frame, spec in FRAME_SPECS.items():
     spec['crs'] = Proj(spec['crs_metrics'])
-    spec['cols'] = (spec['bounds'][2]-spec['bounds'][0])/spec['meters']
-    spec['rows'] = (spec['bounds'][3]-spec['bounds'][1])/spec['meters']
+    spec['cols'] = (spec['bounds'][2]-spec['bounds'][0])//spec['meters']
+    spec['rows'] = (spec['bounds'][3]-spec['bounds'][1])//spec['meters']
 
 
 def _load_lookup(sample_frame='Conus'):
     fname = Path(__file__).parent.joinpath('resources', 'grts_lookup', f'{sample_frame}.csv')
+
+    # Parquet loads an order of magnitude faster than csv, so keep a binary
+    # sidecar next to the csv and use it whenever it's current.
+    pq_fname = fname.with_suffix('.parquet')
+    try:
+        if pq_fname.exists() and pq_fname.stat().st_mtime >= fname.stat().st_mtime:
+            return pd.read_parquet(pq_fname)
+    except (ImportError, OSError):
+        pass
+
     df = pd.read_csv(fname)
+
+    try:
+        df.to_parquet(pq_fname)
+    except (ImportError, OSError):
+        # pyarrow missing or resources dir read-only; the csv still works
+        pass
+
     return df
 
 
+def _get_spec(sample_frame):
+    """
+    Return the FRAME_SPECS entry for a (normalized) sample frame with the
+    lookup table and its hash indexes (frame_id<->GRTS_ID) loaded.
+    """
+    spec = FRAME_SPECS[sample_frame]
+    if 'df' not in spec:
+        spec['df'] = _load_lookup(sample_frame)
+        spec['lookup'] = pd.Series(spec['df'].GRTS_ID.values,
+                                   index=spec['df'].frame_id.values)
+        spec['rlookup'] = pd.Series(spec['df'].frame_id.values,
+                                    index=spec['df'].GRTS_ID.values)
+    return spec
+
+
 def WGS_to_framecoords(long, lat, sample_frame='conus'):
     sample_frame = normalize_grid_frame(sample_frame)
     # print(sample_frame)
@@ -77,110 +111,214 @@ def framecoords_to_WGS(x, y, sample_frame='conus'):
     return transform_coords(x, y, in_proj=in_proj)
 
 
+@lru_cache(maxsize=None)
+def _get_transformer(in_srs, out_srs):
+    # Building a Transformer is expensive; cache one per projection pair.
+    return Transformer.from_crs(in_srs, out_srs, always_xy=True)
+
+
 def transform_coords(x, y, in_proj=WGS84, out_proj=WGS84):
-    return transform(in_proj, out_proj, x, y)
+    return _get_transformer(in_proj.srs, out_proj.srs).transform(x, y)
 
 
-def get_grts(lat, long, sample_frame='conus'):
+def get_grts(lats, longs, sample_frame='conus'):
     """
-    returns the GRTS ID of the cell in which a a coordinate pair lands in.
+    returns the GRTS ID(s) of the cell(s) in which coordinate pair(s) land in.
 
     Parameters
     ----------
-    lat: float
-        The latitude (wgs84) of the point
-    long: float
-        The longitude (wgs84) of the point
+    lats: float or array-like
+        The latitude(s) (wgs84) of the point(s)
+    longs: float or array-like
+        The longitude(s) (wgs84) of the point(s)
     sample_frame: str
         Sample frame to look for a match in. ['Alaska', 'Canada', 'Conus', 'Hawaii', 'Mexico', 'PuertoRico']
 
     Returns
     -------
-    int
+    int for scalar inputs, numpy array of int for array inputs
     """
     sample_frame = normalize_grid_frame(sample_frame)
-    spec = FRAME_SPECS[sample_frame]
+    spec = _get_spec(sample_frame)
 
-    if 'df' not in spec:
-        spec['df'] = _load_lookup(sample_frame)
+    lats = np.asarray(lats, dtype=np.float64)
+    longs = np.asarray(longs, dtype=np.float64)
+    scalar = lats.ndim == 0
 
-    x, y = transform_coords(long, lat, out_proj=spec['crs'])
-    col = int((x - spec['bounds'][0]) / spec['meters'])
-    row = int((y - spec['bounds'][1]) / spec['meters'])
-    frame_id = row * spec['cols'] + col + 1
+    x, y = transform_coords(longs, lats, out_proj=spec['crs'])
+    col = ((np.asarray(x) - spec['bounds'][0]) / spec['meters']).astype(np.int64)
+    row = ((np.asarray(y) - spec['bounds'][1]) / spec['meters']).astype(np.int64)
+    frame_ids = row * spec['cols'] + col + 1
 
-    df = spec['df']
+    grts_ids = spec['lookup'].reindex(np.atleast_1d(frame_ids))
 
-    matching_row = df[df.frame_id==frame_id]['GRTS_ID']
-    if matching_row.shape[0] == 0:
-        raise Exception(f'The provided coordinates ({lat}, {long}) do not have a match in the {sample_frame} frame.')
+    if grts_ids.isnull().any():
+        if scalar:
+            raise Exception(f'The provided coordinates ({lats}, {longs}) do not have a match in the {sample_frame} frame.')
+        missing = np.atleast_1d(grts_ids.isnull().values).nonzero()[0]
+        raise Exception(f'{missing.shape[0]} of the provided coordinates do not have a match in the {sample_frame} frame.')
 
-    grts_id = int(df[df.frame_id==frame_id]['GRTS_ID'])
-    return grts_id
+    if scalar:
+        return int(grts_ids.iloc[0])
+    return grts_ids.values.astype(np.int64)
 
 
-def get_grts_geometry(grts_id, return_proj='wgs84', return_type='poly', sample_frame='Conus'):
+def get_grts_in_bounds(bounds, sample_frame='conus', in_proj=WGS84):
     """
+    Returns the GRTS IDs of all cells that intersect a bounding box.
+
+    Because the NABat frames are regular grids, the row/col arithmetic
+    serves directly as the spatial index: the bounding box is mapped to a
+    range of rows and columns and the resulting frame_ids are resolved
+    through the frame's hash index in one shot.
 
     Parameters
     ----------
-    grts_id: int
-             The GRTS ID of the cell we want the geometry for
-    return_proj: None, proj, str ['wgs84']
-            The projection to use for the return geometry
-            None = The geometry will be returned in the native frame projection
-            A valid proj4 projection will be used for the transform
-            If you pass the string 'wgs84' the geometry will be in wgs84
-    return_type: str
-            'geometry' a shapely geometry will be returned
-            'bounds' a list in the format [minx, miny, maxx, maxy] will be returned.
+    bounds: list
+        [minx, miny, maxx, maxy] of the query box
     sample_frame: str
         Sample frame to look for a match in. ['Alaska', 'Canada', 'Conus', 'Hawaii', 'Mexico', 'PuertoRico']
+    in_proj: pyproj.Proj
+        The projection the bounds are in (wgs84 by default)
 
     Returns
     -------
-
-        List or shapely geometry
+    numpy array of int GRTS IDs
     """
     sample_frame = normalize_grid_frame(sample_frame)
-    spec = FRAME_SPECS[sample_frame]
+    spec = _get_spec(sample_frame)
 
-    if 'df' not in spec:
-        spec['df'] = _load_lookup(sample_frame)
-    df = spec['df']
+    min_x, min_y, max_x, max_y = bounds
+    xs, ys = transform_coords([min_x, min_x, max_x, max_x],
+                              [min_y, max_y, min_y, max_y],
+                              in_proj=in_proj, out_proj=spec['crs'])
+    xs, ys = np.asarray(xs), np.asarray(ys)
 
-    matching_row = df[df.GRTS_ID==grts_id]['frame_id']
-    if matching_row.shape[0] == 0:
-        raise Exception(f'The provided grts_ID ({grts_id}) does not have a match in the {sample_frame} frame.')
-    frame_id = int(matching_row)
+    m = spec['meters']
+    first_col = max(int((xs.min() - spec['bounds'][0]) // m), 0)
+    last_col = min(int((xs.max() - spec['bounds'][0]) // m), spec['cols'] - 1)
+    first_row = max(int((ys.min() - spec['bounds'][1]) // m), 0)
+    last_row = min(int((ys.max() - spec['bounds'][1]) // m), spec['rows'] - 1)
 
-    row = int(frame_id / spec['cols'])
-    col = int(frame_id % spec['cols']) -1
+    cols = np.arange(first_col, last_col + 1)
+    rows = np.arange(first_row, last_row + 1)
+    frame_ids = (rows[:, None] * spec['cols'] + cols[None, :] + 1).ravel()
 
+    grts_ids = spec['lookup'].reindex(frame_ids).dropna()
+    return grts_ids.values.astype(np.int64)
 
-    min_x = spec['bounds'][0] + (col*spec['meters'])
-    min_y = spec['bounds'][1] + (row*spec['meters'])
 
-    max_x = min_x + spec['meters']
-    max_y = min_y + spec['meters']
+def _frame_id_to_bounds(frame_id, spec):
+    """
+    Compute cell bounds [minx, miny, maxx, maxy] in frame coordinates
+    directly from frame_id(s) -- pure grid arithmetic, no table involved.
+    """
+    frame_id = np.asarray(frame_id, dtype=np.int64)
+    row = frame_id // spec['cols']
+    col = frame_id % spec['cols'] - 1
+
+    min_x = spec['bounds'][0] + (col * spec['meters'])
+    min_y = spec['bounds'][1] + (row * spec['meters'])
+
+    return min_x, min_y, min_x + spec['meters'], min_y + spec['meters']
+
+
+def get_grts_bounds_arrays(grts_id, return_proj='wgs84', sample_frame='Conus'):
+    """
+    Returns cell bounds as four parallel numpy arrays (min_x, min_y,
+    max_x, max_y), one entry per GRTS ID.
+
+    This structure-of-arrays layout is the cheapest way to hold many cell
+    geometries: downstream consumers can slice, mask, or reproject the
+    coordinate arrays wholesale and only build per-cell shapely objects
+    for the cells that actually need them.
+
+    Parameters
+    ----------
+    grts_id: int or array-like
+             The GRTS ID(s) of the cell(s) we want the bounds for
+    return_proj: None, proj, str ['wgs84']
+            Same semantics as in get_grts_geometry
+    sample_frame: str
+        Sample frame to look for a match in. ['Alaska', 'Canada', 'Conus', 'Hawaii', 'Mexico', 'PuertoRico']
+
+    Returns
+    -------
+    (min_x, min_y, max_x, max_y) numpy arrays
+    """
+    sample_frame = normalize_grid_frame(sample_frame)
+    spec = _get_spec(sample_frame)
+
+    grts_ids = np.asarray(grts_id, dtype=np.int64)
+
+    frame_ids = spec['rlookup'].reindex(np.atleast_1d(grts_ids))
+    if frame_ids.isnull().any():
+        if grts_ids.ndim == 0:
+            raise Exception(f'The provided grts_ID ({grts_id}) does not have a match in the {sample_frame} frame.')
+        missing = np.atleast_1d(frame_ids.isnull().values).nonzero()[0]
+        raise Exception(f'{missing.shape[0]} of the provided grts_IDs do not have a match in the {sample_frame} frame.')
+
+    min_x, min_y, max_x, max_y = _frame_id_to_bounds(frame_ids.values.astype(np.int64), spec)
 
     if return_proj == 'wgs84':
-        min_x, min_y = transform_coords(min_x, min_y, in_proj=spec['crs'])
-        max_x, max_y = transform_coords(max_x, max_y, in_proj=spec['crs'])
+        out_proj = WGS84
     elif type(return_proj) == Proj:
-        min_x, min_y = transform_coords(min_x, min_y, in_proj=spec['crs'], out_proj=return_proj)
-        max_x, max_y = transform_coords(max_x, max_y, in_proj=spec['crs'], out_proj=return_proj)
-    elif return_proj is not None:
+        out_proj = return_proj
+    elif return_proj is None:
+        out_proj = None
+    else:
         raise Exception(f'The provided return_proj({return_proj}) must be one of "wgs84" or None, or a valid pyproj.Proj"')
 
+    if out_proj is not None:
+        min_x, min_y = transform_coords(min_x, min_y, in_proj=spec['crs'], out_proj=out_proj)
+        max_x, max_y = transform_coords(max_x, max_y, in_proj=spec['crs'], out_proj=out_proj)
+        min_x, min_y = np.asarray(min_x), np.asarray(min_y)
+        max_x, max_y = np.asarray(max_x), np.asarray(max_y)
+
+    return min_x, min_y, max_x, max_y
+
+
+def get_grts_geometry(grts_id, return_proj='wgs84', return_type='poly', sample_frame='Conus'):
+    """
+
+    Parameters
+    ----------
+    grts_id: int or array-like
+             The GRTS ID(s) of the cell(s) we want the geometry for
+    return_proj: None, proj, str ['wgs84']
+            The projection to use for the return geometry
+            None = The geometry will be returned in the native frame projection
+            A valid proj4 projection will be used for the transform
+            If you pass the string 'wgs84' the geometry will be in wgs84
+    return_type: str
+            'poly' a shapely geometry will be returned
+            'bounds' a list in the format [minx, miny, maxx, maxy] will be returned.
+    sample_frame: str
+        Sample frame to look for a match in. ['Alaska', 'Canada', 'Conus', 'Hawaii', 'Mexico', 'PuertoRico']
+
+    Returns
+    -------
+
+        List or shapely geometry for a single ID, a list of geometries or an
+        Nx4 numpy array of bounds for an array of IDs
+    """
+    scalar = np.ndim(grts_id) == 0
+
+    min_x, min_y, max_x, max_y = get_grts_bounds_arrays(grts_id, return_proj=return_proj,
+                                                        sample_frame=sample_frame)
+
     if return_type == 'bounds':
-        return [min_x, min_y, max_x, max_y]
+        if scalar:
+            return [float(min_x[0]), float(min_y[0]), float(max_x[0]), float(max_y[0])]
+        return np.column_stack([min_x, min_y, max_x, max_y])
 
     elif return_type == 'poly':
         from shapely import geometry
-        pointlist = [(min_x, min_y), (min_x, max_y), (max_x, max_y), (max_x, min_y)]
-        poly = geometry.Polygon(pointlist)
-        return poly
+        polys = [geometry.Polygon([(x0, y0), (x0, y1), (x1, y1), (x1, y0)])
+                 for x0, y0, x1, y1 in zip(min_x, min_y, max_x, max_y)]
+        if scalar:
+            return polys[0]
+        return polys
 
     else:
         raise Exception(f'The provided return_type({return_type}) must be one of "bounds" or "poly"')
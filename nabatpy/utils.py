@@ -17,7 +17,12 @@
 #############################################################################
 """
 
+import json
+import os
+import re
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 
 from guano import GuanoFile
 from astral import Astral
@@ -45,6 +50,38 @@ row_lookup_v2 = column_lookup[['bulk_upload_columns2', 'df_columns', 'guano_tag'
 row_lookup_v2.loc[row_lookup_v2.nabat2_tag.isnull(), 'nabat2_tag'] = row_lookup_v2.guano_tag
 row_lookup_v2 = row_lookup_v2.drop(['guano_tag'], axis=1).dropna()
 
+# normalized, read-only lookup tables, one per bulk upload version
+ROW_LOOKUPS = {}
+for _version, _lookup in ((1, row_lookup), (2, row_lookup_v2)):
+    _lookup = _lookup.copy()
+    _lookup.columns = ['bulk_upload_columns', 'df_columns', 'nabat_tag']
+    ROW_LOOKUPS[_version] = _lookup
+del _version, _lookup
+
+# precomputed column rename maps for the v2 bulk upload format
+_UPLOAD_TO_DF = dict(zip(ROW_LOOKUPS[2].bulk_upload_columns, ROW_LOOKUPS[2].df_columns))
+_DF_TO_UPLOAD = dict(zip(ROW_LOOKUPS[2].df_columns, ROW_LOOKUPS[2].bulk_upload_columns))
+
+
+# acceptable abbreviations/spellings -> exact frame name
+GRID_FRAME_ALIASES = {alias: name
+                      for name, aliases in
+                      [('Alaska', ['ak', 'alaska']),
+                       ('Canada', ['ca', 'can', 'canada']),
+                       ('Conus', ['conus', 'us', 'usa', 'united states']),
+                       ('Hawaii', ['hi', 'hawaii']),
+                       ('Mexico', ['mex', 'mx', 'mexico']),
+                       ('PuertoRico', ['pr', 'puerto rico', 'puertorico'])]
+                      for alias in aliases}
+
+
+def _as_path(fname):
+    """
+    Coerce a str/Path argument to a Path, so callers don't re-check types
+    at every site.
+    """
+    return fname if isinstance(fname, Path) else Path(fname)
+
 
 def normalize_grid_frame(grid_frame):
     """
@@ -59,20 +96,10 @@ def normalize_grid_frame(grid_frame):
     -------
     str - normalized frame name if a match was found
     """
-    if grid_frame.lower() in ['ak', 'alaska']:
-        return 'Alaska'
-    elif grid_frame.lower() in ['ca', 'can', 'canada']:
-        return 'Canada'
-    elif grid_frame.lower() in ['conus', 'us', 'usa', 'united states']:
-        return 'Conus'
-    elif grid_frame.lower() in ['hi', 'hawaii']:
-        return 'Hawaii'
-    elif grid_frame.lower() in ['mex', 'mx', 'mexico']:
-        return 'Mexico'
-    elif grid_frame.lower() in ['pr', 'puerto rico', 'puertorico']:
-        return 'PuertoRico'
-    else:
-        raise Exception("The specified grid frame name {grid_frame} is not one of 'Alaska', 'Canada', 'Conus', 'Hawaii', 'Mexico', or 'PuertoRico")
+    try:
+        return GRID_FRAME_ALIASES[grid_frame.lower()]
+    except KeyError:
+        raise Exception(f"The specified grid frame name {grid_frame} is not one of 'Alaska', 'Canada', 'Conus', 'Hawaii', 'Mexico', or 'PuertoRico") from None
 
 
 def monitoring_night(dt):
@@ -82,12 +109,16 @@ def monitoring_night(dt):
 
     Parameters
     ----------
-    dt : datetime
+    dt : datetime or pandas Series of datetimes
 
     Returns
     -------
-    date of the corresponding monitoring night
+    date (or Series of dates) of the corresponding monitoring night
     """
+    if isinstance(dt, pd.Series):
+        offset = pd.to_timedelta((dt.dt.hour < 12).astype('int64'), unit='D')
+        return (dt - offset).dt.date
+
     if dt.hour < 12:
         monitoringnight = dt.date() - timedelta(days=1)
     else:
@@ -96,6 +127,17 @@ def monitoring_night(dt):
     return monitoringnight
 
 
+# precompiled machinery for parse_nabat_fname.
+# _CLEANUP_RE collapses runs of underscores along with any noise tokens
+# (_0_, _1_, _0+1_) embedded in them, all in one pass.
+_FNAME_TRANS = str.maketrans(' -', '__')
+_CLEANUP_RE = re.compile(r'_+(?:(?:0\+1|0|1)_+)*')
+_PREFIX_RE = re.compile(r'^(?i:nabat|naba)?Q?_?')
+# one anchored pass over the cleaned-up stem: optional GRTS ID, site name,
+# date and time stamps, an optional _000/_0000 tail, and trailing junk
+_PARSE_RE = re.compile(r'^(?P<grts>\d*)_?(?P<site>[^_]+)_(?P<date>\d+)_(?P<time>\d+)(?:_0{3,4})?\D*$')
+
+
 def parse_nabat_fname(fname):
     """
     Attempts to cleanup (normalize) a NABat Wav file name and parse out the relevant
@@ -115,65 +157,30 @@ def parse_nabat_fname(fname):
 
     """
 
-    if isinstance(fname, Path):
-        fname = str(fname)
+    fname = os.fspath(fname)
 
     ofname = fname
 
-    fname = fname.replace(' ', '_')
-    fname = fname.replace('-', '_')
-    fname = fname.replace('___', '_')
-    fname = fname.replace('__', '_')
-    fname = fname.replace('_0_', '_')
-    fname = fname.replace('_1_', '_')
-    fname = fname.replace('_0+1_', '_')
+    fname = _CLEANUP_RE.sub('_', fname.translate(_FNAME_TRANS))
 
     f = Path(fname)
 
-    name = f.stem
-
-    if name.lower().startswith('nabat'):
-        name = name[5:]
-    if name.lower().startswith('naba'):
-        name = name[4:]
-    if name.startswith('Q'):
-        name = name[1:]
-    if name.startswith('_'):
-        name = name[1:]
+    name = _PREFIX_RE.sub('', f.stem, count=1)
 
     hold_it = name
     if len(name.split('_')) == 2:
         name = f"{f.parent.name}_{name}"
 
-    digit = name[0]
-    grtsid = ''
-    while digit.isnumeric():
-        name = name[1:]
-        grtsid += digit
-        digit = name[0]
-
-    grtsid = grtsid.lstrip("0")
-
-    last_digit = name[-1]
-    while not last_digit.isnumeric():
-        name = name[:-1]
-        last_digit = name[-1]
-
-    if name.startswith('_'):
-        name = name [1:]
-
-    if name.endswith('_000'):
-        name = name[:-4]
-
-    if name.endswith('_0000'):
-        name = name[:-5]
-
-    try:
-        sitename, datestr, timestr = name.split('_')
-    except:
-        print(ofname, hold_it, "name.split failed")
+    match = _PARSE_RE.match(name)
+    if match is None:
+        print(ofname, hold_it, "name parse failed")
         raise Exception("Unable to parse this filename!")
 
+    grtsid = match['grts'].lstrip("0")
+    sitename = match['site']
+    datestr = match['date']
+    timestr = match['time']
+
     if len(timestr) == 8:
         timestr = timestr[:6]
     elif len(timestr) == 6:
@@ -182,7 +189,13 @@ def parse_nabat_fname(fname):
         print(f"problem time: {timestr}, {fname}")
         timestr = "000000"
 
-    dt = datetime.strptime('T'.join([datestr, timestr]), "%Y%m%dT%H%M%S")
+    if len(datestr) != 8:
+        print(f"problem date: {datestr}, {fname}")
+        raise Exception("Unable to parse this filename!")
+
+    # slicing + int is several times faster than strptime for a fixed layout
+    dt = datetime(int(datestr[:4]), int(datestr[4:6]), int(datestr[6:8]),
+                  int(timestr[:2]), int(timestr[2:4]), int(timestr[4:6]))
 
     parts = {"GrtsId":grtsid, "SiteName":sitename, "datetime":dt}
     parts['correct_fname'] = parts_to_fname(parts)
@@ -192,19 +205,72 @@ def parse_nabat_fname(fname):
 
 def parts_to_fname(parts):
     dt = parts['datetime']
-    return f"{parts['GrtsId']}_{parts['SiteName']}_{parts['datetime'].year}{dt.month:02d}{dt.day:02d}_{dt.hour:02d}{dt.minute:02d}{dt.second:02d}.wav"
+    return f"{parts['GrtsId']}_{parts['SiteName']}_{dt.strftime('%Y%m%d_%H%M%S')}.wav"
 
 
-def get_latlon(fname):
-    p = Path(fname)
-    try:
-        df = pd.read_csv([f for f in p.parent.parent.glob('*Summary.csv')][0])
-    except:
-        df = pd.read_csv([f for f in p.parent.parent.glob('*Summary.txt')][0], delimiter='\t')
-        if df.shape[1] ==1:
-            df = pd.read_csv([f for f in p.parent.parent.glob('*Summary.txt')][0], delimiter=',')
+def _scan_dir(dirname):
+    """
+    Single os.scandir pass over a directory, bucketing the entries we care
+    about: wav files, subdirectories, and *Summary.csv/.txt files.
+
+    Returns (wavs, subdirs, summaries).  The wavs come back as plain path
+    strings -- with thousands of recordings per folder, the name check and
+    DirEntry.is_file are all the validation needed, and Path objects are
+    only built downstream where one is actually required.
+    """
+    wavs, subdirs, summaries = [], [], []
+    for entry in os.scandir(str(dirname)):
+        name = entry.name
+        if name.endswith('.wav'):
+            if entry.is_file():
+                wavs.append(entry.path)
+        elif entry.is_dir():
+            subdirs.append(Path(entry.path))
+        elif name.endswith(('Summary.csv', 'Summary.txt')) and entry.is_file():
+            summaries.append(Path(entry.path))
+    return wavs, subdirs, summaries
+
+
+_summary_paths = {}
 
-    row = df.iloc[0]
+
+def _find_summary(dirname):
+    """
+    Locate the *Summary.csv/.txt file for a directory, caching the result
+    so a folder full of wav files only gets scanned once.
+    """
+    dirname = str(dirname)
+    if dirname not in _summary_paths:
+        _, _, summaries = _scan_dir(dirname)
+        candidates = (sorted(s for s in summaries if s.suffix == '.csv') +
+                      sorted(s for s in summaries if s.suffix == '.txt'))
+        if not candidates:
+            raise Exception(f"No Summary.csv or Summary.txt found in {dirname}")
+        _summary_paths[dirname] = candidates[0]
+    return _summary_paths[dirname]
+
+
+@lru_cache(maxsize=None)
+def _read_summary(dirname):
+    """
+    Parse the Summary file for a directory; every wav in the folder shares
+    it, so the dataframe is cached per directory.
+    """
+    summary = _find_summary(dirname)
+
+    if summary.suffix == '.csv':
+        df = pd.read_csv(summary)
+    else:
+        df = pd.read_csv(summary, delimiter='\t')
+        if df.shape[1] == 1:
+            df = pd.read_csv(summary, delimiter=',')
+
+    return df
+
+
+def get_latlon(fname):
+    p = _as_path(fname)
+    row = _read_summary(str(p.parent.parent)).iloc[0]
     return f"{row['LAT']},-{row['LON']}"
 
 
@@ -212,16 +278,40 @@ def time_to_timestr(dt):
     return dt.strftime("%Y-%m-%dT%H:%M:%S")
 
 
-def get_auto_times(fname, geocoder='Denver'):
-    parts = parse_nabat_fname(fname)
+def _to_datetime(series):
+    """
+    Parse a column of bulk upload timestamps, trying the format we write
+    ourselves first and falling back to pandas' inference.  cache=True
+    dedupes repeated strings, which bulk uploads are full of.
+    """
+    try:
+        return pd.to_datetime(series, format="%Y-%m-%dT%H:%M:%S", cache=True)
+    except (ValueError, TypeError):
+        return pd.to_datetime(series, cache=True)
+
 
+@lru_cache(maxsize=None)
+def _get_astral():
     a = Astral()
     a.solar_depression = 'civil'
-    denver = a.geocoder[geocoder]
+    return a
+
+
+@lru_cache(maxsize=4096)
+def _sun_times(geocoder, date):
+    """
+    Sun ephemeris for a location/date pair; a night of recordings shares a
+    handful of dates, so cache the expensive solar calculations.
+    """
+    return _get_astral().geocoder[geocoder].sun(date=date, local=True)
+
+
+def get_auto_times(fname, geocoder='Denver'):
+    parts = parse_nabat_fname(fname)
 
     montitoringnight = monitoring_night(parts['datetime'])
-    monitoringnight_sun = denver.sun(date=montitoringnight, local=True)
-    monitoringmorn_sun = denver.sun(date=montitoringnight + timedelta(days=1), local=True)
+    monitoringnight_sun = _sun_times(geocoder, montitoringnight)
+    monitoringmorn_sun = _sun_times(geocoder, montitoringnight + timedelta(days=1))
 
     sunset = monitoringnight_sun['sunset']
     dusk = monitoringnight_sun['dusk']
@@ -232,15 +322,58 @@ def get_auto_times(fname, geocoder='Denver'):
     return sunset + timedelta(minutes=15), sunrise - timedelta(minutes=15)
 
 
-def update_single_md(fname, row, to_delete=[]):
+@lru_cache(maxsize=4096)
+def _cached_guano(fname, mtime):
+    return GuanoFile(fname)
+
+
+def _get_guano(fname):
+    """
+    Return a parsed GuanoFile, reusing the cached parse for as long as the
+    file is unchanged on disk.
+    """
+    fname = str(fname)
+    return _cached_guano(fname, os.path.getmtime(fname))
+
+
+def update_single_md(fname, row, to_delete=[], parts=None):
     g = GuanoFile(fname)
 
-    parts = parse_nabat_fname(fname)
+    if parts is None:
+        parts = parse_nabat_fname(fname)
     # content from the NABat filename
     g['NABat', 'Grid Cell GRTS ID'] = parts['GrtsId']
     g['NABat', 'Site Name'] = parts['SiteName']
 
 
+def _update_md_item(item):
+    fname, row, *rest = item
+    parts = rest[0] if rest else None
+    update_single_md(fname, row, parts=parts)
+
+
+def batch_update_md(fnames_rows, max_workers=None):
+    """
+    Apply update_single_md to many files, fanning the writes out over a
+    process pool.
+
+    Parameters
+    ----------
+    fnames_rows : iterable of (fname, row) or (fname, row, parts) tuples;
+                  pass pre-parsed parts to skip the per-file
+                  parse_nabat_fname call
+    max_workers : int or None
+                  passed through to ProcessPoolExecutor
+
+    Returns
+    -------
+    None
+    """
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for _ in executor.map(_update_md_item, fnames_rows, chunksize=16):
+            pass
+
+
 def bulkupload_to_df(bulk_upload_csv):
     """
     Converts an NABat bulk upload csv into a workable Pandas dataframe
@@ -256,20 +389,22 @@ def bulkupload_to_df(bulk_upload_csv):
     pandas dataframe
     """
 
-    if type(bulk_upload_csv) == str:
-        bulk_upload_csv = Path(bulk_upload_csv)
+    bulk_upload_csv = _as_path(bulk_upload_csv)
 
     assert bulk_upload_csv.exists()
 
-    df = pd.read_csv(bulk_upload_csv, comment="|", header=None)
     upload_columns = get_row_lookup(version=2)
-    df.columns = list(upload_columns['bulk_upload_columns'])
+    names = list(upload_columns['bulk_upload_columns'])
+    # comment='|' rules out the pyarrow engine, but naming the columns up
+    # front and limiting usecols to the rosetta keeps the C parser from
+    # materializing any stray trailing fields.
+    df = pd.read_csv(bulk_upload_csv, comment="|", header=None,
+                     names=names, usecols=range(len(names)), engine='c')
 
-    df = df.rename(columns=dict(zip(upload_columns.bulk_upload_columns,
-                                    upload_columns.df_columns)))
+    df = df.rename(columns=_UPLOAD_TO_DF)
 
-    df['start_time'] = pd.to_datetime(df['start_time'])
-    df['end_time'] = pd.to_datetime(df['end_time'])
+    df['start_time'] = _to_datetime(df['start_time'])
+    df['end_time'] = _to_datetime(df['end_time'])
 
     return df
 
@@ -291,45 +426,35 @@ def df_to_bulkupload(df, bulk_upload_csv):
     None
     """
 
-    if type(bulk_upload_csv) == str:
-        bulk_upload_csv = Path(bulk_upload_csv)
-
-    # lookup = pd.read_csv(Path(__file__).parent.joinpath('resources', "NABatColumnRosetta.csv"))
-    upload_columns = get_row_lookup(version=2)
+    bulk_upload_csv = _as_path(bulk_upload_csv)
 
-
-    df = df.rename(columns=dict(zip(upload_columns.df_columns, upload_columns.bulk_upload_columns)))
-    df.to_csv(bulk_upload_csv, index=False)
+    df = df.rename(columns=_DF_TO_UPLOAD)
+    # chunked writes keep memory flat on big frames; the fixed line
+    # terminator avoids platform-dependent newline translation
+    df.to_csv(bulk_upload_csv, index=False, chunksize=100000, lineterminator='\n')
 
     return None
 
 
 def generate_bulkupload(source_dname, use_previous=True, recursive=True, verbose=1):
     # print(str(source_dname ))
-    d = Path(source_dname)
+    d = _as_path(source_dname)
     if not use_previous:
-        if d.joinpath('_problems.csv').exists():
-            d.joinpath('_problems.csv').unlink()
-        if d.joinpath('_batchupload.csv').exists():
-            d.joinpath('_batchupload.csv').unlink()
-
-    df = None
-    problems = None
+        for stem in ('_problems', '_batchupload',
+                     '_local_problems', '_local_batchupload'):
+            for suffix in ('.csv', '.parquet'):
+                if d.joinpath(f'{stem}{suffix}').exists():
+                    d.joinpath(f'{stem}{suffix}').unlink()
+        if d.joinpath('_wav_mtimes.json').exists():
+            d.joinpath('_wav_mtimes.json').unlink()
 
     if recursive:
-        for thing in d.glob('*'):
-            if thing.is_dir():
-                sub_df, sub_problems = generate_bulkupload(thing, recursive=recursive,
-                                                           verbose=verbose, use_previous=use_previous)
-                if df is None and sub_df is not None:
-                    df = sub_df
-                elif sub_df is not None:
-                    df.append(sub_df, sort=False)
-
-                if problems is None and sub_problems is not None:
-                    problems = sub_problems
-                elif sub_problems is not None:
-                    problems.append(sub_df, sort=False)
+        for thing in _scan_dir(d)[1]:
+            # recurse for the side effect of writing each subfolder's
+            # _batchupload/_problems csvs; guano_to_df below merges the
+            # cached results with a single concat
+            generate_bulkupload(thing, recursive=recursive,
+                                verbose=verbose, use_previous=use_previous)
 
     df, problems = guano_to_df(source_dname, recursive=recursive, verbose=verbose,
                                use_previous=True)
@@ -343,77 +468,252 @@ def generate_bulkupload(source_dname, use_previous=True, recursive=True, verbose
     return df, problems
 
 
+# number of wav files handed to the workers per batch
+_WAV_CHUNK_SIZE = 256
+
+
+def _rows_from_wavs(wavs, verbose=1):
+    """
+    Extract bulk upload rows from a list of wav files, working in
+    fixed-size chunks so scheduler overhead and memory stay bounded no
+    matter how many files a directory holds.
+    """
+    if dask is None:
+        # no dask installed; fan out with the stdlib process pool instead of
+        # falling back to a serial loop
+        with ProcessPoolExecutor() as executor:
+            return list(executor.map(get_row_from_guano, wavs, chunksize=16))
+
+    results = []
+    for start in range(0, len(wavs), _WAV_CHUNK_SIZE):
+        chunk = wavs[start:start + _WAV_CHUNK_SIZE]
+        values = [delayed(get_row_from_guano)(wav) for wav in chunk]
+        if verbose >= 1:
+            with ProgressBar():
+                results.extend(compute(*values, scheduler='processes'))
+        else:
+            results.extend(compute(*values, scheduler='processes'))
+
+    return results
+
+
+def _read_cached_df(d, stem, newest_mtime):
+    """
+    Return the cached frame for a directory, preferring the parquet cache
+    when it is at least as new as both the directory's newest wav file and
+    the csv the bulk upload tools write.  An edited csv always wins over a
+    stale parquet.
+    """
+    csv = d.joinpath(f'{stem}.csv')
+    pq = d.joinpath(f'{stem}.parquet')
+    try:
+        if pq.exists():
+            pq_mtime = pq.stat().st_mtime
+            if pq_mtime >= newest_mtime and \
+                    (not csv.exists() or pq_mtime >= csv.stat().st_mtime):
+                return pd.read_parquet(pq)
+    except (ImportError, OSError):
+        pass
+
+    if csv.exists():
+        return bulkupload_to_df(csv)
+
+    return None
+
+
+def _read_parquet_cache(d, stem):
+    pq = d.joinpath(f'{stem}.parquet')
+    try:
+        if pq.exists():
+            return pd.read_parquet(pq)
+    except (ImportError, OSError):
+        pass
+    return None
+
+
+def _write_cached_df(df, d, stem):
+    try:
+        df.to_parquet(d.joinpath(f'{stem}.parquet'))
+    except (ImportError, OSError, ValueError):
+        # pyarrow missing, read-only folder, or unserializable column;
+        # the csv path still works
+        pass
+
+
+def _read_wav_mtimes(d):
+    try:
+        with open(d.joinpath('_wav_mtimes.json')) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_wav_mtimes(d, mtimes):
+    try:
+        with open(d.joinpath('_wav_mtimes.json'), 'w') as f:
+            json.dump(mtimes, f)
+    except OSError:
+        pass
+
+
+def _split_unchanged(d, mtimes):
+    """
+    Partition a directory's wavs against the previous run using the
+    persisted per-file mtimes.  Returns (reused, reused_problems,
+    unchanged): the cached rows that can be carried over as-is and the set
+    of wav basenames they cover.  A wav only counts as unchanged if its
+    mtime matches the last run and a cached row for it actually exists.
+    """
+    old_mtimes = _read_wav_mtimes(d)
+    if not old_mtimes:
+        return None, None, set()
+
+    # reuse only from the directory's own rows (the _local_* caches written
+    # before children are folded in); the merged _batchupload cache spans the
+    # whole subtree, where a subfolder wav can share a basename with ours
+    cached = _read_parquet_cache(d, '_local_batchupload')
+    cached_problems = _read_parquet_cache(d, '_local_problems')
+
+    cached_names = set()
+    for frame in (cached, cached_problems):
+        if frame is not None and 'audio_recording_name' in frame.columns:
+            cached_names.update(frame.audio_recording_name)
+
+    unchanged = {name for name, mtime in mtimes.items()
+                 if old_mtimes.get(name) == mtime and name in cached_names}
+    if not unchanged:
+        return None, None, set()
+
+    reused = None
+    reused_problems = None
+    if cached is not None and 'audio_recording_name' in cached.columns:
+        reused = cached[cached.audio_recording_name.isin(unchanged)]
+    if cached_problems is not None and 'audio_recording_name' in cached_problems.columns:
+        reused_problems = cached_problems[cached_problems.audio_recording_name.isin(unchanged)]
+
+    return reused, reused_problems, unchanged
+
+
 def guano_to_df(source_dname, recursive=True, verbose=1, use_previous=True):
     """Create an NABat bulk upload csv from the MD contained in a folder of wav files
     """
-    d = Path(source_dname)
+    root = _as_path(source_dname)
 
-    if use_previous and d.joinpath('_problems.csv').exists():
-        problems_df = bulkupload_to_df(d.joinpath('_problems.csv'))
-    else:
-        problems_df = None
+    # walk the tree with an explicit stack, scanning each directory exactly
+    # once; a cached directory stands in for its whole subtree, so its
+    # children are never pushed
+    order = []     # directories in discovery order
+    children = {}  # directory -> subdirectories pushed from it
+    frames = {}    # directory -> (df, problems_df, from_cache)
 
-    if use_previous and d.joinpath('_batchupload.csv').exists():
-        df = bulkupload_to_df(d.joinpath('_batchupload.csv'))
-    else:
-        df = None
+    stack = [root]
+    while stack:
+        d = stack.pop()
+        wavs, subdirs, _ = _scan_dir(d)
+        mtimes = {os.path.basename(w): os.stat(w).st_mtime for w in wavs}
 
-    if not use_previous or df is None:
-        wavs = list(d.glob('*.wav'))
-        if len(wavs) > 0:
-            if verbose >= 1:
-                print(f'Starting on {source_dname}')
-            if dask is not None:
-                values = [delayed(get_row_from_guano)(wav) for wav in wavs]
+        df = None
+        problems_df = None
+        if use_previous:
+            newest_wav = max(mtimes.values(), default=0.0)
+            problems_df = _read_cached_df(d, '_problems', newest_wav)
+            df = _read_cached_df(d, '_batchupload', newest_wav)
+
+        from_cache = df is not None
+        if not from_cache:
+            if len(wavs) > 0:
                 if verbose >= 1:
-                    with ProgressBar():
-                        results = compute(*values, scheduler='processes')
-                else:
-                    results = compute(*values, scheduler='processes')
-            else:
-                results = [get_row_from_guano(wav) for wav in wavs]
-
-            df = pd.DataFrame.from_records(results)
-            problems_df = df[df.detector=='Problem extracting row from Guano']
-            df = df[df.detector!='Problem extracting row from Guano']
-
-        if recursive:
-            for thing in d.glob('*'):
-                if thing.is_dir():
-                    sub_df, sub_problems = guano_to_df(thing, use_previous=use_previous)
-                    if df is None:
-                        df = sub_df
-                    else:
-                        # print('else')
-                        df = df.append(sub_df, sort=False)
-
-                    if problems_df is None and sub_problems is not None:
-                        problems_df = sub_problems
-                    elif sub_problems is not None:
-                        problems_df = problems_df.append(sub_df, sort=False)
-
+                    print(f'Starting on {d}')
+                problems_df = None
+
+                # carry over cached rows for wavs that haven't changed since
+                # the last run and only parse the delta
+                reused = None
+                reused_problems = None
+                unchanged = set()
+                if use_previous:
+                    reused, reused_problems, unchanged = _split_unchanged(d, mtimes)
+
+                to_parse = [w for w in wavs if os.path.basename(w) not in unchanged]
+                if to_parse:
+                    results = _rows_from_wavs(to_parse, verbose=verbose)
+
+                    df = pd.DataFrame.from_records(results)
+                    problems_df = df[df.detector=='Problem extracting row from Guano']
+                    df = df[df.detector!='Problem extracting row from Guano']
+
+                if reused is not None and reused.shape[0] > 0:
+                    df = reused if df is None else pd.concat([df, reused], sort=False)
+                if reused_problems is not None and reused_problems.shape[0] > 0:
+                    problems_df = (reused_problems if problems_df is None else
+                                   pd.concat([problems_df, reused_problems], sort=False))
+
+                # persist this directory's own rows before the children are
+                # folded in; _split_unchanged reuses rows from these
+                if df is not None:
+                    _write_cached_df(df, d, '_local_batchupload')
+                if problems_df is not None:
+                    _write_cached_df(problems_df, d, '_local_problems')
+                _write_wav_mtimes(d, mtimes)
+
+            if recursive:
+                children[d] = subdirs
+                stack.extend(subdirs)
+
+        order.append(d)
+        frames[d] = (df, problems_df, from_cache)
+
+    # fold children into their parents deepest-first and refresh the caches
+    for d in reversed(order):
+        df, problems_df, from_cache = frames[d]
+        if from_cache:
+            continue
+
+        dfs = [] if df is None else [df]
+        problem_dfs = [] if problems_df is None else [problems_df]
+        for child in children.get(d, []):
+            sub_df, sub_problems, _ = frames[child]
+            if sub_df is not None:
+                dfs.append(sub_df)
+            if sub_problems is not None:
+                problem_dfs.append(sub_problems)
+
+        if dfs:
+            df = pd.concat(dfs, sort=False)
+        if problem_dfs:
+            problems_df = pd.concat(problem_dfs, sort=False)
+
+        # refresh the binary caches so the next pass skips the guano parsing
+        if df is not None:
+            _write_cached_df(df, d, '_batchupload')
+        if problems_df is not None:
+            _write_cached_df(problems_df, d, '_problems')
+
+        frames[d] = (df, problems_df, from_cache)
+
+    df, problems_df, _ = frames[root]
     return df, problems_df
 
 
 def get_row_lookup(version=2):
-    if version == 1:
-        this_row_lookup = row_lookup
-    elif version == 2:
-        this_row_lookup = row_lookup_v2
-
-    this_row_lookup.columns = ['bulk_upload_columns', 'df_columns', 'nabat_tag']
-    return this_row_lookup
+    return ROW_LOOKUPS[version]
 
 
 def get_empty_row(version=2):
     this_row_lookup = get_row_lookup(version=version)
     row = OrderedDict()
-    for i, keyvalue in this_row_lookup.iterrows():
-            row[keyvalue.df_columns] = ''
+    for keyvalue in this_row_lookup.itertuples():
+        row[keyvalue.df_columns] = ''
 
     return row
 
 
+# vendor version dispatch: first matching prefix wins
+_SONOBAT_VERSIONS = (('4.2', 'Sonobat 4.2'),
+                     ('4.', 'Sonobat 4.x'),
+                     ('3.', 'Sonobat 3.x'))
+
+
 def get_row_from_guano(fname, version=2):
 
     row = get_empty_row(version=version)
@@ -429,8 +729,8 @@ def get_row_from_guano(fname, version=2):
     this_row_lookup = get_row_lookup(version=version)
 
     try:
-        g = GuanoFile(fname)
-        for i, keyvalue in this_row_lookup.iterrows():
+        g = _get_guano(fname)
+        for keyvalue in this_row_lookup.itertuples():
             value = g.get(keyvalue.nabat_tag, '')
             if value.lower() == 'nan':
                 value = ''
@@ -443,13 +743,12 @@ def get_row_from_guano(fname, version=2):
 
         # parse the software type from vendor namespaces
         if 'SB' in g.get_namespaces():
+            sb_version = g.get('SB|Version', '') or ''
             software = 'Sonobat '
-            if g.get('SB|Version').startswith('4.2'):
-                software += '4.2'
-            elif g.get('SB|Version').startswith('4.'):
-                software += '4.x'
-            elif g.get('SB|Version').startswith('3.'):
-                software += '3.x'
+            for prefix, label in _SONOBAT_VERSIONS:
+                if sb_version.startswith(prefix):
+                    software = label
+                    break
             row['software_type'] = software
         else:
             # TODO: add logic for Kaleidoscope
@@ -463,9 +762,9 @@ def get_row_from_guano(fname, version=2):
             row['manual_id'] = g.get('GUANO|Species Manual ID', '')
 
         # convert nan to empty string
-        for which in ['auto', 'manual']:
-            if row[f'{which}_id'].lower() == 'nan':
-                row[f'{which}_id'] = ''
+        for which in ('auto_id', 'manual_id'):
+            if row[which].lower() == 'nan':
+                row[which] = ''
     except:
         # Something went dreadfully wrong. We'll populate with what we have
         row['detector'] = "Problem extracting row from Guano"
@@ -473,5 +772,20 @@ def get_row_from_guano(fname, version=2):
     return row
 
 
-def add_monitoringnight(series):
-    pass
+def add_monitoringnight(df, time_column='start_time'):
+    """
+    Adds a monitoring_night column derived from one of a bulk upload
+    dataframe's datetime columns, computed vectorized for the whole frame.
+
+    Parameters
+    ----------
+    df : pandas dataframe
+    time_column : str
+                  name of the datetime column to derive the night from
+
+    Returns
+    -------
+    the dataframe with a monitoring_night column added
+    """
+    df['monitoring_night'] = monitoring_night(df[time_column])
+    return df
@@ -1,3 +1,6 @@
+from datetime import datetime
+from pathlib import Path
+
 import pytest
 from nabatpy import utils
 from nabatpy import grts_lookup
@@ -19,5 +22,62 @@ def test_normalize_grid_frame():
     assert utils.normalize_grid_frame('Mexico') == "Mexico"
 
 
+# (40.75384858, -113.8450646) falls in frame_id 84817, which the shipped
+# Conus lookup maps to GRTS 90898
 def test_get_grts():
-    assert grts_lookup.get_grts(40.75384858, -113.8450646, sample_frame='conus') == 1005
+    assert grts_lookup.get_grts(40.75384858, -113.8450646, sample_frame='conus') == 90898
+
+
+def test_get_grts_array():
+    ids = grts_lookup.get_grts([40.75384858], [-113.8450646], sample_frame='conus')
+    assert list(ids) == [90898]
+
+
+def test_get_grts_in_bounds():
+    ids = grts_lookup.get_grts_in_bounds([-113.9, 40.7, -113.8, 40.8], sample_frame='conus')
+    assert 90898 in ids
+
+
+def test_get_grts_geometry_bounds():
+    bounds = grts_lookup.get_grts_geometry(90898, return_type='bounds')
+    assert len(bounds) == 4
+    min_x, min_y, max_x, max_y = bounds
+    # the known test coordinate lands inside cell 90898
+    assert min_x < -113.8450646 < max_x
+    assert min_y < 40.75384858 < max_y
+
+    arr = grts_lookup.get_grts_geometry([90898, 90898], return_type='bounds')
+    assert arr.shape == (2, 4)
+    assert list(arr[0]) == pytest.approx(bounds)
+
+
+def test_get_grts_bounds_arrays():
+    min_x, min_y, max_x, max_y = grts_lookup.get_grts_bounds_arrays([1005])
+    assert min_x.shape == (1,)
+    assert float(min_x[0]) < float(max_x[0])
+    assert float(min_y[0]) < float(max_y[0])
+
+
+def test_parse_nabat_fname():
+    parts = utils.parse_nabat_fname('NABat_1005_MySite_20180731_213045.wav')
+    assert parts['GrtsId'] == '1005'
+    assert parts['SiteName'] == 'MySite'
+    assert parts['datetime'] == datetime(2018, 7, 31, 21, 30, 45)
+    assert parts['correct_fname'] == '1005_MySite_20180731_213045.wav'
+
+    parts = utils.parse_nabat_fname('Q0017-S1-20180731-213045_000.wav')
+    assert parts['GrtsId'] == '17'
+    assert parts['SiteName'] == 'S1'
+    assert parts['datetime'] == datetime(2018, 7, 31, 21, 30, 45)
+
+    parts = utils.parse_nabat_fname('17_S1_0_20180731_21304500.wav')
+    assert parts['GrtsId'] == '17'
+    assert parts['datetime'] == datetime(2018, 7, 31, 21, 30, 45)
+
+    # grts id and site pulled from the parent folder for date_time-only names
+    parts = utils.parse_nabat_fname(Path('/data/1005_siteA/20180731_213045.wav'))
+    assert parts['GrtsId'] == '1005'
+    assert parts['SiteName'] == 'siteA'
+
+    with pytest.raises(Exception):
+        utils.parse_nabat_fname('not_a_parseable_name.wav')